@@ -43,17 +43,165 @@ PERFORMANCE TARGETS:
 - Memory Usage: < 2GB for large documents
 """
 
+import argparse
 import json
+import os
 import re
+import sys
 import fitz  # PyMuPDF
 from pathlib import Path
 import time
 import logging
 import unicodedata
+import math
+from collections import Counter, namedtuple
+from itertools import chain
 from typing import List, Dict, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import multiprocessing as mp
 
+# orjson serializes the outline JSON in C when it is installed; the standard
+# library json module is used otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Patterns applied to every line, compiled once at import
+NUMBERED_LIST_ITEM_RE = re.compile(r'^\d+\.\s+[a-z]')  # "1. lowercase" list items
+NUMBERED_PREFIX_RE = re.compile(r'^\d+\.\s+')
+NUM_DOT_PREFIX_RE = re.compile(r'^\d+\.')
+ALPHA_DOT_PREFIX_RE = re.compile(r'^[a-z]\.')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Leading characters that mark a bullet or list item, tested with text[:1] in BULLET_CHARS
+BULLET_CHARS = frozenset('•*-◦▪▫')
+
+# English heading patterns as (regex, level label), compiled once at import and
+# shared by every processor instead of being compiled per instance
+HEADING_PATTERN_SOURCES = (
+    # Document titles and main sections (H1)
+    (r'^(Chapter\s+\d+|CHAPTER\s+\d+)', 'chapter'),
+    (r'^(Part\s+\d+|PART\s+\d+)', 'part'),
+    (r'^(Section\s+\d+|SECTION\s+\d+)', 'section'),
+    (r'^(Introduction|Conclusion|Abstract|Summary|Overview|Background)', 'main'),
+    (r'^(Round\s+\d+[A-Z]?|Challenge|Mission|Theme)', 'main'),
+    
+    # Subsections (H2)
+    (r'^(\d+\.\s+[A-Z][^.]*)', 'section'),
+    (r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*:)', 'subsection'),
+    (r'^(What|Why|How|When|Where|Who)\s+[A-Z]', 'subsection'),
+    (r'^(Method|Procedure|Steps|Instructions|Requirements)', 'subsection'),
+    (r'^(Test\s+Case|Example|Sample|Challenge|Brief)', 'subsection'),
+    
+    # Detailed subsections (H3)
+    (r'^(\d+\.\d+\s+[A-Z][^.]*)', 'subsection'),
+    (r'^([a-z]\s*\.\s+[A-Z][^.]*)', 'detail'),
+    (r'^(Ingredients|Instructions|Steps|Tips|Notes)', 'detail'),
+    (r'^(History|Background|Overview|Summary)', 'detail'),
+    (r'^(Key|Main|Primary|Secondary)', 'detail'),
+)
+HEADING_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), label) for pattern, label in HEADING_PATTERN_SOURCES
+)
+
+# Heading patterns per language as (regex, level label), compiled once at import
+MULTILINGUAL_PATTERN_SOURCES = {
+    # Chinese (Simplified & Traditional)
+    'chinese': [
+        (r'^(第[一二三四五六七八九十\d]+章)', 'chapter'),  # 第一章, 第1章
+        (r'^([一二三四五六七八九十\d]+[、．])', 'section'),  # 一、二、
+        (r'^(\d+[、．]\d+)', 'subsection'),  # 1.1, 1、1
+        (r'^(章节|章|节|部分|段落)', 'section'),
+    ],
+
+    # Spanish
+    'spanish': [
+        (r'^(Capítulo\s+\d+|CAPÍTULO\s+\d+)', 'chapter'),
+        (r'^(Sección\s+\d+|SECCIÓN\s+\d+)', 'section'),
+        (r'^(Introducción|INTRODUCCIÓN)', 'section'),
+        (r'^(Conclusión|CONCLUSIÓN)', 'section'),
+        (r'^(Resumen|RESUMEN)', 'section'),
+    ],
+
+    # French
+    'french': [
+        (r'^(Chapitre\s+\d+|CHAPITRE\s+\d+)', 'chapter'),
+        (r'^(Section\s+\d+|SECTION\s+\d+)', 'section'),
+        (r'^(Introduction|INTRODUCTION)', 'section'),
+        (r'^(Conclusion|CONCLUSION)', 'section'),
+        (r'^(Résumé|RÉSUMÉ)', 'section'),
+    ],
+
+    # German
+    'german': [
+        (r'^(Kapitel\s+\d+|KAPITEL\s+\d+)', 'chapter'),
+        (r'^(Abschnitt\s+\d+|ABSCHNITT\s+\d+)', 'section'),
+        (r'^(Einleitung|EINLEITUNG)', 'section'),
+        (r'^(Schlussfolgerung|SCHLUSSFOLGERUNG)', 'section'),
+        (r'^(Zusammenfassung|ZUSAMMENFASSUNG)', 'section'),
+    ],
+
+    # Japanese
+    'japanese': [
+        (r'^(第[一二三四五六七八九十\d]+章)', 'chapter'),  # 第1章
+        (r'^([一二三四五六七八九十\d]+[、．])', 'section'),  # 1、2、
+        (r'^(はじめに|序論|序章)', 'section'),  # Introduction
+        (r'^(結論|まとめ|終章)', 'section'),  # Conclusion
+        (r'^(概要|要約)', 'section'),  # Summary
+    ],
+
+    # Arabic (RTL support)
+    'arabic': [
+        (r'^(الفصل\s+\d+)', 'chapter'),  # Chapter
+        (r'^(القسم\s+\d+)', 'section'),  # Section
+        (r'^(مقدمة|المقدمة)', 'section'),  # Introduction
+        (r'^(خاتمة|الخاتمة)', 'section'),  # Conclusion
+        (r'^(ملخص|الملخص)', 'section'),  # Summary
+    ],
+
+    # Russian
+    'russian': [
+        (r'^(Глава\s+\d+|ГЛАВА\s+\d+)', 'chapter'),
+        (r'^(Раздел\s+\d+|РАЗДЕЛ\s+\d+)', 'section'),
+        (r'^(Введение|ВВЕДЕНИЕ)', 'section'),
+        (r'^(Заключение|ЗАКЛЮЧЕНИЕ)', 'section'),
+        (r'^(Резюме|РЕЗЮМЕ)', 'section'),
+    ]
+}
+MULTILINGUAL_PATTERNS = {
+    lang: tuple((re.compile(pattern, re.IGNORECASE), label) for pattern, label in patterns)
+    for lang, patterns in MULTILINGUAL_PATTERN_SOURCES.items()
+}
+
+# Spans kept per page; beyond this a page is OCR noise or a dense table rather
+# than something a heading search needs to read in full
+MAX_SPANS_PER_PAGE = 2000
+
+# PyMuPDF span flag bit for bold text (see TEXT_FONT_BOLD)
+FLAG_BOLD = 1 << 4
+
+# Span-level text extraction flags: the default "dict" flags also embed every
+# image's binary data in the result, which heading detection never reads
+TEXT_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# TOC depth -> heading level, indexed by depth clamped to 1..4 (index 0 unused)
+INT_LEVEL_MAP = ("H1", "H1", "H2", "H3", "H3")
+
+# Named level -> heading level; unknown names map to H2
+NAMED_LEVEL_MAP = {
+    'chapter': "H1", 'h1': "H1", 'level_1': "H1", 'title': "H1", 'main': "H1",
+    'section': "H2", 'h2': "H2", 'level_2': "H2", 'subsection': "H2",
+    'subsubsection': "H3", 'h3': "H3", 'level_3': "H3", 'heading': "H3",
+}
+
+# Merged (compiled pattern, label) tuples per language. The pattern tables are
+# identical for every processor, so batches sharing a language merge them once.
+LANGUAGE_PATTERN_CACHE: Dict[str, Tuple] = {}
+
+# Per-document font size thresholds used by the span classifier
+HeadingThresholds = namedtuple("HeadingThresholds", "avg max h1 h2 h3")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -87,126 +235,93 @@ class HighPerformancePDFProcessor:
        - Remove duplicates while preserving best matches
     """
 
+    # Function words that never form a heading on their own
+    COMMON_WORDS = frozenset(["the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "this", "that", "which", "have", "has", "been", "will", "would", "could", "should"])
+
+    # Characteristic words per language; a language scores one point per entry
+    # found anywhere in the lowercased sample (substring presence, not counts)
+    LANGUAGE_INDICATORS = {
+        'chinese': ('的', '是', '在', '了', '和', '有', '我', '你', '他', '她', '它', '们'),
+        'spanish': ('el', 'la', 'de', 'que', 'y', 'en', 'un', 'es', 'se', 'no', 'te', 'lo'),
+        'french': ('le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en', 'avoir', 'que', 'pour'),
+        'german': ('der', 'die', 'und', 'in', 'den', 'von', 'zu', 'das', 'mit', 'sich', 'des', 'auf'),
+        'japanese': ('の', 'に', 'は', 'を', 'た', 'が', 'で', 'て', 'と', 'し', 'れ', 'さ'),
+        'arabic': ('في', 'من', 'إلى', 'على', 'أن', 'هذا', 'هذه', 'التي', 'الذي', 'كان', 'كما'),
+        'russian': ('в', 'и', 'не', 'на', 'я', 'быть', 'он', 'с', 'что', 'а', 'по', 'это'),
+    }
+
+    # Final character -> minimum length for a heading ending in it; shorter text is a fragment
+    FRAGMENT_END_MIN_LENGTHS = {':': 10, ')': 10, '.': 10}
+
+    # Single words that are frequently styled like headings but are not
+    NON_HEADING_SINGLE_WORDS = frozenset(["you", "it", "go", "magic", "time", "lets", "ahead", "matters", "showtime", "mode", "scale", "lever", "cap", "lamp"])
+
+    # Single words lifted from running prose (slogans, intro copy) that are set in
+    # heading typography but are never headings on their own
+    FRAGMENT_SINGLE_WORDS = frozenset([
+        "sit", "there", "spoke", "connected", "narrated", "meaning", "across", "entire",
+        "library", "future", "building", "want", "help", "shape", "mission",
+        "reimagine", "humble", "intelligent", "interactive", "experience",
+        "understands", "structure", "surfaces", "insights", "responds", "trusted",
+        "research", "companion", "journey", "ahead", "kick", "things", "brains",
+        "extract", "structured", "outlines", "raw", "pdfs", "blazing", "speed",
+        "pinpoint", "accuracy", "power", "device", "intelligence", "sections", "links",
+        "related", "ideas", "together", "showtime", "beautiful", "intuitive", "reading",
+        "webapp", "using", "adobe", "embed", "api", "round", "work", "design",
+        "futuristic", "world", "flooded", "documents", "wins", "content", "context",
+        "tools", "read", "learn", "connect", "insight", "whisperer", "stage", "time",
+        "between", "lines", "dots", "build", "feels", "magic", "go", "understand",
+        "document", "theme", "connecting", "through", "docs", "handed", "instead",
+        "simply", "tasked", "making", "sense", "machine", "job", "outline",
+        "essentially", "title", "headings", "clean", "hierarchical", "format",
+        "foundation", "rest", "hackathon", "what", "if", "every", "opened", "didnt",
+        "just", "thats", "challenge"
+    ])
+
     def __init__(self):
         self.setup_heading_patterns()
         self.setup_multilingual_patterns()
 
     def setup_heading_patterns(self):
         """Setup comprehensive heading patterns for better hierarchy detection"""
-        self.heading_patterns = [
-            # Document titles and main sections (H1)
-            (r'^(Chapter\s+\d+|CHAPTER\s+\d+)', 'chapter'),
-            (r'^(Part\s+\d+|PART\s+\d+)', 'part'),
-            (r'^(Section\s+\d+|SECTION\s+\d+)', 'section'),
-            (r'^(Introduction|Conclusion|Abstract|Summary|Overview|Background)', 'main'),
-            (r'^(Round\s+\d+[A-Z]?|Challenge|Mission|Theme)', 'main'),
-            
-            # Subsections (H2)
-            (r'^(\d+\.\s+[A-Z][^.]*)', 'section'),
-            (r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*:)', 'subsection'),
-            (r'^(What|Why|How|When|Where|Who)\s+[A-Z]', 'subsection'),
-            (r'^(Method|Procedure|Steps|Instructions|Requirements)', 'subsection'),
-            (r'^(Test\s+Case|Example|Sample|Challenge|Brief)', 'subsection'),
-            
-            # Detailed subsections (H3)
-            (r'^(\d+\.\d+\s+[A-Z][^.]*)', 'subsection'),
-            (r'^([a-z]\s*\.\s+[A-Z][^.]*)', 'detail'),
-            (r'^(Ingredients|Instructions|Steps|Tips|Notes)', 'detail'),
-            (r'^(History|Background|Overview|Summary)', 'detail'),
-            (r'^(Key|Main|Primary|Secondary)', 'detail'),
-        ]
+        # Compiled once at import and shared by every processor instance
+        self.heading_patterns = HEADING_PATTERNS
 
     def setup_multilingual_patterns(self):
         """Setup multilingual heading patterns for international documents"""
-        self.multilingual_patterns = {
-            # Chinese (Simplified & Traditional)
-            'chinese': [
-                (r'^(第[一二三四五六七八九十\d]+章)', 'chapter'),  # 第一章, 第1章
-                (r'^([一二三四五六七八九十\d]+[、．])', 'section'),  # 一、二、
-                (r'^(\d+[、．]\d+)', 'subsection'),  # 1.1, 1、1
-                (r'^(章节|章|节|部分|段落)', 'section'),
-            ],
-
-            # Spanish
-            'spanish': [
-                (r'^(Capítulo\s+\d+|CAPÍTULO\s+\d+)', 'chapter'),
-                (r'^(Sección\s+\d+|SECCIÓN\s+\d+)', 'section'),
-                (r'^(Introducción|INTRODUCCIÓN)', 'section'),
-                (r'^(Conclusión|CONCLUSIÓN)', 'section'),
-                (r'^(Resumen|RESUMEN)', 'section'),
-            ],
-
-            # French
-            'french': [
-                (r'^(Chapitre\s+\d+|CHAPITRE\s+\d+)', 'chapter'),
-                (r'^(Section\s+\d+|SECTION\s+\d+)', 'section'),
-                (r'^(Introduction|INTRODUCTION)', 'section'),
-                (r'^(Conclusion|CONCLUSION)', 'section'),
-                (r'^(Résumé|RÉSUMÉ)', 'section'),
-            ],
-
-            # German
-            'german': [
-                (r'^(Kapitel\s+\d+|KAPITEL\s+\d+)', 'chapter'),
-                (r'^(Abschnitt\s+\d+|ABSCHNITT\s+\d+)', 'section'),
-                (r'^(Einleitung|EINLEITUNG)', 'section'),
-                (r'^(Schlussfolgerung|SCHLUSSFOLGERUNG)', 'section'),
-                (r'^(Zusammenfassung|ZUSAMMENFASSUNG)', 'section'),
-            ],
-
-            # Japanese
-            'japanese': [
-                (r'^(第[一二三四五六七八九十\d]+章)', 'chapter'),  # 第1章
-                (r'^([一二三四五六七八九十\d]+[、．])', 'section'),  # 1、2、
-                (r'^(はじめに|序論|序章)', 'section'),  # Introduction
-                (r'^(結論|まとめ|終章)', 'section'),  # Conclusion
-                (r'^(概要|要約)', 'section'),  # Summary
-            ],
-
-            # Arabic (RTL support)
-            'arabic': [
-                (r'^(الفصل\s+\d+)', 'chapter'),  # Chapter
-                (r'^(القسم\s+\d+)', 'section'),  # Section
-                (r'^(مقدمة|المقدمة)', 'section'),  # Introduction
-                (r'^(خاتمة|الخاتمة)', 'section'),  # Conclusion
-                (r'^(ملخص|الملخص)', 'section'),  # Summary
-            ],
-
-            # Russian
-            'russian': [
-                (r'^(Глава\s+\d+|ГЛАВА\s+\d+)', 'chapter'),
-                (r'^(Раздел\s+\d+|РАЗДЕЛ\s+\d+)', 'section'),
-                (r'^(Введение|ВВЕДЕНИЕ)', 'section'),
-                (r'^(Заключение|ЗАКЛЮЧЕНИЕ)', 'section'),
-                (r'^(Резюме|РЕЗЮМЕ)', 'section'),
-            ]
-        }
-
-    def detect_document_language(self, doc) -> str:
-        """Detect the primary language of the document"""
-        # Sample text from first few pages
-        sample_text = ""
+        # Compiled once at import and shared by every processor instance
+        self.multilingual_patterns = MULTILINGUAL_PATTERNS
+
+    def detect_document_language(self, doc, textpages: Optional[List] = None) -> str:
+        """Detect the primary language of the document
+
+        textpages is an optional get_sample_textpages(doc) result whose text is
+        reused for the sample instead of running a fresh extraction per page.
+        """
+        sample_text = self.get_language_sample(doc, textpages)
+        return self.score_document_language(sample_text)
+
+    def get_language_sample(self, doc, textpages: Optional[List] = None) -> str:
+        """Collect sample text from the first few pages for language detection"""
+        textpages = textpages or []
+        parts = []
         for page_num in range(min(3, len(doc))):  # Check first 3 pages
-            page = doc[page_num]
-            text = page.get_text()
-            sample_text += text[:1000]  # First 1000 chars per page
-
+            if page_num < len(textpages):
+                page, textpage = textpages[page_num]
+            else:
+                page, textpage = doc[page_num], None
+            text = page.get_text(textpage=textpage)
+            parts.append(text[:1000])  # First 1000 chars per page
+        # Bounded to 3000 characters however long the pages are
+        return "".join(parts)
+
+    def score_document_language(self, sample_text: str) -> str:
+        """Score sample text against per-language indicator words"""
         sample_text = sample_text.lower()
 
-        # Language detection based on characteristic patterns
-        language_indicators = {
-            'chinese': ['的', '是', '在', '了', '和', '有', '我', '你', '他', '她', '它', '们'],
-            'spanish': ['el', 'la', 'de', 'que', 'y', 'en', 'un', 'es', 'se', 'no', 'te', 'lo'],
-            'french': ['le', 'de', 'et', 'à', 'un', 'il', 'être', 'et', 'en', 'avoir', 'que', 'pour'],
-            'german': ['der', 'die', 'und', 'in', 'den', 'von', 'zu', 'das', 'mit', 'sich', 'des', 'auf'],
-            'japanese': ['の', 'に', 'は', 'を', 'た', 'が', 'で', 'て', 'と', 'し', 'れ', 'さ'],
-            'arabic': ['في', 'من', 'إلى', 'على', 'أن', 'هذا', 'هذه', 'التي', 'الذي', 'كان', 'كما'],
-            'russian': ['в', 'и', 'не', 'на', 'я', 'быть', 'он', 'с', 'что', 'а', 'по', 'это']
-        }
-
         # Score each language
         language_scores = {}
-        for lang, indicators in language_indicators.items():
+        for lang, indicators in self.LANGUAGE_INDICATORS.items():
             score = sum(1 for indicator in indicators if indicator in sample_text)
             if score > 0:
                 language_scores[lang] = score
@@ -219,112 +334,82 @@ class HighPerformancePDFProcessor:
         else:
             return 'english'
 
-    def get_patterns_for_language(self, language: str) -> List[Tuple[str, str]]:
-        """Get heading patterns for the detected language"""
-        patterns = self.heading_patterns.copy()  # Start with English patterns
+    def get_patterns_for_language(self, language: str) -> Tuple[Tuple[re.Pattern, str], ...]:
+        """Get heading patterns for the detected language (merged once per language)"""
+        patterns = LANGUAGE_PATTERN_CACHE.get(language)
+        if patterns is None:
+            patterns = tuple(self.heading_patterns)  # Start with English patterns
+
+            # Add language-specific patterns
+            if language in self.multilingual_patterns:
+                patterns += tuple(self.multilingual_patterns[language])
+                logger.info(f"Added {len(self.multilingual_patterns[language])} patterns for {language}")
 
-        # Add language-specific patterns
-        if language in self.multilingual_patterns:
-            patterns.extend(self.multilingual_patterns[language])
-            logger.info(f"Added {len(self.multilingual_patterns[language])} patterns for {language}")
+            LANGUAGE_PATTERN_CACHE[language] = patterns
 
         return patterns
 
-    def extract_text_with_formatting(self, page) -> List[Dict]:
-        """Extract text with font information for better heading detection"""
+    def extract_text_with_formatting(self, page, text_dict: Optional[Dict] = None) -> List[Dict]:
+        """Extract text with font information for better heading detection
+
+        Pass an already extracted get_page_text_dict(page) result as text_dict to
+        avoid running MuPDF's layout pass on the same page twice.
+
+        The returned entries are the span dicts PyMuPDF already allocated (with
+        "text" replaced by its stripped form) rather than fresh copies; they carry
+        "text", "font", "size", "flags" (bold/italic bits) and "bbox", plus an
+        "is_bold" bool decoded once here so the analyzers need not test the bit.
+
+        At most MAX_SPANS_PER_PAGE spans are returned per page.
+        """
         blocks = []
-        text_dict = page.get_text("dict")
-        
-        for block in text_dict["blocks"]:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"].strip()
-                        if text:
-                            blocks.append({
-                                "text": text,
-                                "font": span["font"],
-                                "size": span["size"],
-                                "flags": span["flags"],  # Bold, italic flags
-                                "bbox": span["bbox"]
-                            })
+        if text_dict is None:
+            text_dict = self.get_page_text_dict(page)
+        
+        # Image blocks have no "lines"; text lines are walked flat across blocks
+        text_lines = chain.from_iterable(block["lines"] for block in text_dict["blocks"] if "lines" in block)
+        for line in text_lines:
+            for span in line["spans"]:
+                text = span["text"].strip()
+                if text:
+                    span["text"] = text
+                    span["is_bold"] = bool(span["flags"] & FLAG_BOLD)
+                    blocks.append(span)
+                    if len(blocks) >= MAX_SPANS_PER_PAGE:
+                        logger.warning(f"Truncated page {page.number + 1} at {MAX_SPANS_PER_PAGE} text spans")
+                        return blocks
         return blocks
     
-    def analyze_advanced_typography(self, doc) -> Dict:
-        """Advanced typography analysis for better heading detection"""
-        font_analysis = {
-            'sizes': [],
-            'fonts': {},
-            'styles': {},
-            'line_lengths': [],
-            'spacing_patterns': [],
-            'color_patterns': {},
-            'alignment_patterns': {}
-        }
-
-        # Sample first few pages for comprehensive analysis
-        sample_pages = min(5, len(doc))
-        for page_num in range(sample_pages):
+    def get_page_text_dict(self, page, textpage=None) -> Dict:
+        """Extract span-level text of a page without image blocks
+
+        An existing TextPage of the page (see get_sample_textpages) skips the
+        MuPDF layout pass.
+        """
+        return page.get_text("dict", flags=TEXT_DICT_FLAGS, textpage=textpage)
+
+    def get_sample_textpages(self, doc, sample_pages: int = 5) -> List[Tuple]:
+        """Run MuPDF's layout pass once for each of the first few pages
+
+        Returns (page, TextPage) pairs; a TextPage only weakly references its
+        page, so the page is kept alongside it. TEXT_DICT_FLAGS equals the flags
+        of plain get_text(), so each TextPage serves both the language sample
+        and the span dicts of its page.
+        """
+        pairs = []
+        for page_num in range(min(sample_pages, len(doc))):
             page = doc[page_num]
-            text_dict = page.get_text("dict")
-
-            for block in text_dict["blocks"]:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        line_text = ""
-                        line_spans = []
-
-                        for span in line["spans"]:
-                            line_text += span["text"]
-                            line_spans.append(span)
-
-                            # Collect font data
-                            font_analysis['sizes'].append(span["size"])
-                            font_key = span["font"]
-                            font_analysis['fonts'][font_key] = font_analysis['fonts'].get(font_key, 0) + 1
-
-                            # Style analysis
-                            style_key = f"size_{int(span['size'])}_bold_{bool(span['flags'] & 2**4)}_italic_{bool(span['flags'] & 2**6)}"
-                            font_analysis['styles'][style_key] = font_analysis['styles'].get(style_key, 0) + 1
-
-                            # Color analysis (if available)
-                            if 'color' in span:
-                                color = span['color']
-                                font_analysis['color_patterns'][color] = font_analysis['color_patterns'].get(color, 0) + 1
-
-                        # Line length analysis
-                        if line_text.strip():
-                            font_analysis['line_lengths'].append(len(line_text.strip()))
-
-                            # Spacing analysis (bbox analysis)
-                            if len(line_spans) > 0:
-                                bbox = line["bbox"]
-                                spacing = bbox[3] - bbox[1]  # Height
-                                font_analysis['spacing_patterns'].append(spacing)
-
-        # Calculate statistics
-        if font_analysis['sizes']:
-            sizes = font_analysis['sizes']
-            font_analysis['avg_size'] = sum(sizes) / len(sizes)
-            font_analysis['size_std'] = (sum((x - font_analysis['avg_size'])**2 for x in sizes) / len(sizes))**0.5
-            font_analysis['size_percentiles'] = {
-                '25': sorted(sizes)[len(sizes)//4],
-                '50': sorted(sizes)[len(sizes)//2],
-                '75': sorted(sizes)[3*len(sizes)//4],
-                '90': sorted(sizes)[9*len(sizes)//10],
-                '95': sorted(sizes)[19*len(sizes)//20]
-            }
+            pairs.append((page, page.get_textpage(flags=TEXT_DICT_FLAGS)))
+        return pairs
 
-        if font_analysis['line_lengths']:
-            lengths = font_analysis['line_lengths']
-            font_analysis['avg_line_length'] = sum(lengths) / len(lengths)
-            font_analysis['short_line_threshold'] = sorted(lengths)[len(lengths)//4]  # 25th percentile
+    def get_sample_page_dicts(self, doc, sample_pages: int = 5, textpages: Optional[List[Tuple]] = None) -> List[Dict]:
+        """Extract the text dicts of the first few pages
 
-        # Most common font
-        if font_analysis['fonts']:
-            font_analysis['common_font'] = max(font_analysis['fonts'].items(), key=lambda x: x[1])[0]
-
-        return font_analysis
+        textpages is an optional get_sample_textpages(doc) result to extract from.
+        """
+        if textpages is None:
+            return [self.get_page_text_dict(doc[page_num]) for page_num in range(min(sample_pages, len(doc)))]
+        return [self.get_page_text_dict(page, textpage) for page, textpage in textpages[:sample_pages]]
 
     def is_heading_by_advanced_analysis(self, span: Dict, typography: Dict, line_context: Dict) -> Tuple[bool, str]:
         """Advanced analysis to determine if text is a heading"""
@@ -336,11 +421,11 @@ class HighPerformancePDFProcessor:
             return False, ""
         
         # Skip bullet points and numbered lists
-        if text.startswith('•') or text.startswith('-') or text.startswith('*'):
+        if text.startswith(('•', '-', '*')):
             return False, ""
         
-        # Skip numbered lists that are not headings
-        if re.match(r'^\d+\.\s+[a-z]', text.lower()):
+        # Skip numbered lists that are not headings (only digit-led text can be one)
+        if text[0].isdigit() and NUMBERED_LIST_ITEM_RE.match(text.lower()):
             return False, ""
         
         # Skip table headers
@@ -348,17 +433,16 @@ class HighPerformancePDFProcessor:
             return False, ""
         
         # Skip sentence fragments
-        if text.endswith(',') or text.endswith('—') or text.endswith('...'):
+        if text.endswith((',', '—', '...')):
             return False, ""
         
         # Skip if it's just common words
-        common_words = ["the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "this", "that", "which", "have", "has", "been", "will", "would", "could", "should"]
         text_words = text.lower().split()
-        if len(text_words) <= 3 and all(word in common_words for word in text_words):
+        if len(text_words) <= 3 and self.COMMON_WORDS.issuperset(text_words):
             return False, ""
         
         # Skip single words that are likely not headings
-        if len(text_words) == 1 and text_words[0] in ["you", "it", "go", "magic", "time", "lets", "ahead", "matters", "showtime", "mode", "scale", "lever", "cap", "lamp"]:
+        if len(text_words) == 1 and text_words[0] in self.NON_HEADING_SINGLE_WORDS:
             return False, ""
         
         # Get font statistics
@@ -371,7 +455,7 @@ class HighPerformancePDFProcessor:
         is_extremely_large = font_size > max_font_size * 0.9
         
         # Check if it's bold
-        is_bold = span.get("flags", 0) & 2**4
+        is_bold = span.get("flags", 0) & FLAG_BOLD
         
         # Check positioning (headings are usually at the start of lines)
         is_at_start = line_context.get("is_at_start", False)
@@ -474,22 +558,9 @@ class HighPerformancePDFProcessor:
     def map_level_to_heading(self, level_input) -> str:
         """Map various level inputs to H1, H2, H3 format as required by hackathon"""
         if isinstance(level_input, int):
-            if level_input <= 1:
-                return "H1"
-            elif level_input == 2:
-                return "H2"
-            else:
-                return "H3"
+            return INT_LEVEL_MAP[min(max(level_input, 1), 4)]
         elif isinstance(level_input, str):
-            level_lower = level_input.lower()
-            if level_lower in ['chapter', 'h1', 'level_1', 'title', 'main']:
-                return "H1"
-            elif level_lower in ['section', 'h2', 'level_2', 'subsection']:
-                return "H2"
-            elif level_lower in ['subsection', 'subsubsection', 'h3', 'level_3', 'heading']:
-                return "H3"
-            else:
-                return "H2"  # Default fallback
+            return NAMED_LEVEL_MAP.get(level_input.lower(), "H2")  # Default fallback
         return "H2"  # Ultimate fallback
 
     def determine_heading_level(self, text: str, font_size: float, typography: Dict, is_first_heading: bool = False) -> str:
@@ -542,157 +613,168 @@ class HighPerformancePDFProcessor:
 
         return outline
     
-    def extract_outline_from_content(self, doc, language_patterns=None) -> List[Dict]:
-        """Extract outline using professional PDF heading detection"""
+    def extract_outline_from_content(self, doc, language_patterns=None, sample_dicts: Optional[List[Dict]] = None,
+                                     first_page_lines: Optional[List[Dict]] = None) -> List[Dict]:
+        """Extract outline using professional PDF heading detection
+
+        Pass the first page's extract_text_with_formatting() output as
+        first_page_lines to reuse an extraction the caller already did.
+        """
         outline = []
         
-        # Step 1: Analyze typography across the document
-        typography = self.analyze_advanced_typography(doc)
+        # Step 1: Font size thresholds. No document statistics are gathered, so
+        # every document gets the default avg_font_size and max_font_size.
+        thresholds = self.build_heading_thresholds({})
         
-        # Step 2: Find all potential headings with better detection
-        all_headings = []
+        # The sampled page dicts are reused below instead of being re-extracted
+        if sample_dicts is None:
+            sample_dicts = self.get_sample_page_dicts(doc)
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_lines = self.extract_text_with_formatting(page)
-            
-            for line_index, line in enumerate(page_lines):
-                text = line["text"].strip()
-                font_size = line["size"]
-                is_bold = line.get("flags", 0) & 2**4
+        # Step 2: Find all potential headings with better detection. Duplicates
+        # are kept here: the caller counts raw detections before falling back to
+        # the TOC, and clean_and_deduplicate_outline removes them afterwards.
+        
+        # The classifier only accepts bold lines or lines above the h3 size, so
+        # plain body text can be dropped before any string work
+        min_plain_heading_size = thresholds.h3
+        
+        # Per-line callables and sets bound once, outside the loop
+        collapse_whitespace = WHITESPACE_RE.sub
+        common_words = self.COMMON_WORDS
+        classify_heading_text = self.classify_heading_text
+        
+        # A failure part-way through (a damaged page, say) keeps the headings
+        # found on the pages before it instead of discarding the whole outline
+        page_num = 0
+        try:
+            for page_num in range(len(doc)):
+                if page_num == 0 and first_page_lines is not None:
+                    page_lines = first_page_lines
+                else:
+                    # The sampled leading pages are already extracted
+                    text_dict = sample_dicts[page_num] if page_num < len(sample_dicts) else None
+                    page_lines = self.extract_text_with_formatting(doc[page_num], text_dict)
+                # End of the heading run last scanned on this page
+                run_end = 0
+                for line_index, line in enumerate(page_lines):
+                    is_bold = line["is_bold"]
+                    font_size = line["size"]
+                    if not is_bold and font_size <= min_plain_heading_size:
+                        continue
                 
-                # Skip empty or very short text
-                if len(text) < 2:
-                    continue
+                    text = line["text"]
                 
-                # Skip bullet points and numbered lists
-                if text.startswith(('•', '*', '-', '◦', '▪', '▫')):
-                    continue
+                    # Skip empty or very short text
+                    if len(text) < 2:
+                        continue
                 
-                # Skip numbered lists that are not headings
-                if re.match(r'^\d+\.\s+[a-z]', text.lower()):
-                    continue
+                    # Headings must start with a capital letter; rejecting here spares
+                    # body lines all of the string checks below. It also rules out
+                    # bullet points and numbered list items, which start with a
+                    # bullet character or a digit.
+                    if not text[0].isupper():
+                        continue
                 
-                # Skip table headers
-                if '|' in text or '\t' in text:
-                    continue
+                    # Skip table headers
+                    if '|' in text or '\t' in text:
+                        continue
                 
-                # Skip URLs and technical details
-                if text.startswith('http') or text.startswith('www') or 'github.com' in text.lower():
-                    continue
+                    # Clean and lowercase the text once for every check below
+                    clean_text = collapse_whitespace(' ', text).strip()
+                    clean_lower = clean_text.lower()
                 
-                # Clean the text
-                clean_text = re.sub(r'\s+', ' ', text).strip()
+                    # Skip URLs and technical details
+                    if text.startswith(('http', 'www')) or 'github.com' in clean_lower:
+                        continue
                 
-                # Skip if too long (likely not a heading)
-                if len(clean_text) > 80:
-                    continue
+                    # Skip if too long (likely not a heading)
+                    if len(clean_text) > 80:
+                        continue
                 
-                # Skip if it's just numbers or special characters
-                if clean_text.isdigit() or not any(c.isalnum() for c in clean_text):
-                    continue
+                    # Skip if it's just special characters. The text starts with an
+                    # uppercase character, so it is never all digits, and the scan
+                    # stops at that first character unless it is a symbol like "Ⓐ".
+                    if not any(c.isalnum() for c in clean_text):
+                        continue
                 
-                # Skip sentence fragments
-                if clean_text.endswith(',') or clean_text.endswith('—') or clean_text.endswith('...'):
-                    continue
+                    # Skip sentence fragments
+                    if clean_text.endswith((',', '—', '...')):
+                        continue
                 
-                # Skip if it's just common words
-                common_words = ["the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "this", "that", "which", "have", "has", "been", "will", "would", "could", "should"]
-                text_words = clean_text.lower().split()
-                if len(text_words) <= 3 and all(word in common_words for word in text_words):
-                    continue
+                    # Skip if it's just common words
+                    text_words = clean_lower.split()
+                    if len(text_words) <= 3 and common_words.issuperset(text_words):
+                        continue
                 
-                # Professional heading detection
-                is_heading, level = self.detect_heading_professionally(line, typography)
+                    # Professional heading detection
+                    # (same as detect_heading_professionally, reusing the values read above)
+                    is_heading, level = classify_heading_text(text, font_size, is_bold, thresholds)
                 
-                if is_heading:
-                    # Get complete heading by checking until same font size or bold ends
-                    complete_text = self.get_complete_heading(page_lines, line_index, line)
+                    if is_heading:
+                        # Get complete heading by checking until same font size or bold ends
+                        if line_index >= run_end:
+                            run_end = self.get_heading_run_end(page_lines, line_index)
+                        complete_text = self.get_complete_heading(page_lines, line_index, line, run_end)
                     
-                    # Additional filtering to remove sentence fragments
-                    if self.is_proper_heading(complete_text):
-                        all_headings.append({
-                            "text": complete_text,
-                            "level": level,
-                            "page": page_num,  # Page numbers start from 0
-                            "font_size": font_size,
-                            "is_bold": is_bold,
-                            "y_position": line.get("y", 0)
-                        })
+                        # Additional filtering to remove sentence fragments; a heading that is
+                        # just this line reuses the lowercased text and words from above
+                        if complete_text == clean_text:
+                            is_proper = self.is_proper_heading(complete_text, clean_lower, text_words)
+                        else:
+                            is_proper = self.is_proper_heading(complete_text)
+                        if is_proper:
+                            # Pages are scanned in order, so the outline is already
+                            # sorted by page
+                            outline.append({
+                                "text": complete_text,
+                                "level": level,
+                                "page": page_num  # Page numbers start from 0
+                            })
         
-        # Step 3: Sort and rank headings properly
-        if all_headings:
-            # Sort by page number, then by position on page
-            all_headings.sort(key=lambda x: (x["page"], x.get("y_position", 0)))
-            
-            # Remove font_size, is_bold, and y_position from final output
-            for heading in all_headings:
-                if "font_size" in heading:
-                    del heading["font_size"]
-                if "is_bold" in heading:
-                    del heading["is_bold"]
-                if "y_position" in heading:
-                    del heading["y_position"]
-            
-            outline = all_headings
+        except Exception as e:
+            logger.warning(f"Outline truncated, extraction failed on page {page_num + 1}: {e}")
         
         return outline
     
-    def detect_heading_professionally(self, line, typography) -> Tuple[bool, str]:
+    def build_heading_thresholds(self, typography: Dict) -> HeadingThresholds:
+        """Compute the font size thresholds once per document"""
+        avg_font_size = typography.get("avg_font_size", 12)
+        max_font_size = typography.get("max_font_size", 16)
+
+        return HeadingThresholds(
+            avg=avg_font_size,
+            max=max_font_size,
+            h1=max_font_size * 0.9,  # Top 10% of font sizes
+            h2=max_font_size * 0.7,  # Top 30% of font sizes
+            h3=avg_font_size * 1.3,  # Above average font size
+        )
+
+    def detect_heading_professionally(self, line, thresholds: HeadingThresholds) -> Tuple[bool, str]:
         """Professional heading detection using typography analysis"""
-        text = line["text"].strip()
+        text = line["text"]
         font_size = line["size"]
-        is_bold = line.get("flags", 0) & 2**4
+        is_bold = line["is_bold"]
+
+        return self.classify_heading_text(text, font_size, is_bold, thresholds)
 
+    def classify_heading_text(self, text: str, font_size: float, is_bold: bool,
+                              thresholds: HeadingThresholds) -> Tuple[bool, str]:
+        """Score a span from its text and typography alone"""
         # Skip if text is too short or too long
         if len(text) < 2 or len(text) > 80:
             return False, ""
 
-        # Get font size thresholds from typography analysis
-        avg_font_size = typography.get("avg_font_size", 12)
-        max_font_size = typography.get("max_font_size", 16)
-        
-        # Calculate proper font size thresholds for hierarchy
-        h1_threshold = max_font_size * 0.9  # Top 10% of font sizes
-        h2_threshold = max_font_size * 0.7  # Top 30% of font sizes  
-        h3_threshold = avg_font_size * 1.3   # Above average font size
-        
-        # Must be either bold OR large font
-        is_large_enough = font_size > h3_threshold
-        if not (is_bold or is_large_enough):
-            return False, ""
-        
         # Must start with a capital letter
-        if not text or not text[0].isupper():
+        if not text[0].isupper():
             return False, ""
 
-        # Check for heading patterns
-        heading_patterns = [
-            r'^(chapter|section|part)\s+\d+',
-            r'^\d+\.\s+[A-Z]',
-            r'^[A-Z][A-Z\s]+$',  # ALL CAPS
-            r'^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*$',  # Title Case
-        ]
-
-        matches_pattern = any(re.match(pattern, text, re.IGNORECASE) for pattern in heading_patterns)
-
-        # Check for heading indicator words
-        heading_words = [
-            "introduction", "conclusion", "summary", "abstract", "overview",
-            "background", "methodology", "results", "discussion", "analysis",
-            "recommendations", "appendix", "references", "bibliography",
-            "welcome", "connecting", "dots", "challenge", "rethink", "reading",
-            "rediscover", "knowledge", "round", "understand", "document",
-            "docker", "requirements", "tips", "persona", "driven", "intelligence",
-            "test", "case", "academic", "research", "business", "analysis",
-            "educational", "content", "required", "output", "mission", "journey",
-            "ahead", "matters", "theme", "brief", "specification", "constraints",
-            "deliverables", "scoring", "criteria", "submission", "checklist",
-            "execution", "what", "you", "need", "build", "will", "provided"
-        ]
-        contains_heading_word = any(word in text.lower() for word in heading_words)
+        # Must be either bold OR large font
+        h1_threshold, h2_threshold, h3_threshold = thresholds.h1, thresholds.h2, thresholds.h3
+        if not (is_bold or font_size > h3_threshold):
+            return False, ""
 
-        # Professional scoring system
+        # Professional scoring system. Past the gate above, bold (+4) or a size
+        # above h3 (at least +4) always reaches the threshold on its own.
         score = 0
 
         if font_size >= h1_threshold:
@@ -703,10 +785,6 @@ class HighPerformancePDFProcessor:
             score += 4
         if is_bold:
             score += 4
-        if matches_pattern:
-            score += 5
-        if contains_heading_word:
-            score += 3
 
         # Lower threshold for better detection
         is_heading = score >= 4
@@ -725,121 +803,91 @@ class HighPerformancePDFProcessor:
 
         return False, ""
     
-    def is_proper_heading(self, text: str) -> bool:
-        """Check if text is a proper heading (not a sentence fragment)"""
+    def is_proper_heading(self, text: str, text_lower: Optional[str] = None, text_words: Optional[List[str]] = None) -> bool:
+        """Check if text is a proper heading (not a sentence fragment)
+
+        Callers that already lowercased and split the text can pass text_lower
+        and text_words (text_lower.split()) to skip recomputing them.
+        """
         # Must start with a capital letter
         if not text or not text[0].isupper():
             return False
         
-        # Skip if it's just a single word that's too short
-        if len(text.split()) == 1 and len(text) < 3:
+        # Skip sentence fragments that are too short (this also covers short single words)
+        if len(text) < 5:
             return False
         
-        # Skip if it's just common words
-        common_words = ["the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "this", "that", "which", "have", "has", "been", "will", "would", "could", "should"]
-        text_words = text.lower().split()
-        if len(text_words) <= 2 and all(word in common_words for word in text_words):
+        # Skip questions, sentence fragments and dangling dashes
+        if text.endswith(('?', ',', '—', '-', '...')) or text.startswith(('—', '-')):
             return False
         
-        # Skip if it's just a question or fragment
-        if text.endswith("?"):
+        # Skip short fragments ending in a colon, bracket or full stop
+        min_length = self.FRAGMENT_END_MIN_LENGTHS.get(text[-1])
+        if min_length and len(text) < min_length:
             return False
         
-        # Skip if it's just a specification or technical detail
-        if any(spec in text.lower() for spec in ["≤", "amd64", "x86_64", "filename.pdf", "200mb", "1gb"]):
+        # Skip if it's just common words
+        if text_lower is None:
+            text_lower = text.lower()
+        if text_words is None:
+            text_words = text_lower.split()
+        if len(text_words) <= 2 and self.COMMON_WORDS.issuperset(text_words):
             return False
         
-        # Skip sentence fragments
-        if text.endswith(',') or text.endswith('—') or text.endswith('...'):
+        # Skip if it's just a specification or technical detail
+        if any(spec in text_lower for spec in ["≤", "amd64", "x86_64", "filename.pdf", "200mb", "1gb"]):
             return False
         
         # Skip if it's just punctuation or special characters
         if not any(c.isalnum() for c in text):
             return False
         
-        # Skip if it's just a single word that's likely not a heading
-        if len(text_words) == 1 and text_words[0] in ["you", "it", "go", "magic", "time", "lets", "ahead", "matters", "showtime", "mode", "scale", "lever", "cap", "lamp"]:
-            return False
-        
-        # Skip if it's just a fragment or incomplete text
-        if text.endswith(":") and len(text) < 10:
-            return False
-        
-        if text.endswith(")") and len(text) < 10:
-            return False
-        
-        if text.endswith(".") and len(text) < 8:
-            return False
-        
-        # Skip sentence fragments that are too short
-        if len(text) < 5:
-            return False
-        
-        # Skip if it's just a single word that's not a proper heading
-        if len(text_words) == 1 and text_words[0] in ["sit", "there", "spoke", "connected", "narrated", "meaning", "across", "entire", "library", "future", "building", "want", "help", "shape", "mission", "reimagine", "humble", "intelligent", "interactive", "experience", "understands", "structure", "surfaces", "insights", "responds", "trusted", "research", "companion", "journey", "ahead", "kick", "things", "building", "brains", "extract", "structured", "outlines", "raw", "pdfs", "blazing", "speed", "pinpoint", "accuracy", "power", "device", "intelligence", "understands", "sections", "links", "related", "ideas", "together", "showtime", "beautiful", "intuitive", "reading", "webapp", "using", "adobe", "embed", "api", "using", "round", "work", "design", "futuristic", "webapp", "world", "flooded", "documents", "wins", "content", "context", "building", "tools", "future", "read", "learn", "connect", "insight", "whisperer", "stage", "time", "read", "between", "lines", "connect", "dots", "build", "experience", "feels", "magic", "go", "understand", "document", "theme", "connecting", "dots", "through", "docs", "handed", "instead", "simply", "reading", "tasked", "making", "sense", "machine", "job", "extract", "structured", "outline", "document", "essentially", "title", "headings", "clean", "hierarchical", "format", "outline", "foundation", "rest", "hackathon", "journey"]:
-            return False
-        
-        # Skip if it's just a fragment or incomplete sentence
-        if text.startswith("—") or text.startswith("-"):
-            return False
-        
-        if text.endswith("—") or text.endswith("-"):
-            return False
-        
-        # Skip if it's just a single word that's likely a verb or common word
-        if len(text_words) == 1 and text_words[0] in ["what", "if", "every", "time", "opened", "didnt", "just", "there", "spoke", "connected", "ideas", "narrated", "meaning", "across", "entire", "library", "thats", "future", "building", "want", "help", "shape", "connecting", "dots", "challenge", "mission", "reimagine", "humble", "intelligent", "interactive", "experience", "understands", "structure", "surfaces", "insights", "responds", "trusted", "research", "companion", "journey", "ahead", "kick", "things", "building", "brains", "extract", "structured", "outlines", "raw", "pdfs", "blazing", "speed", "pinpoint", "accuracy", "power", "device", "intelligence", "understands", "sections", "links", "related", "ideas", "together", "showtime", "beautiful", "intuitive", "reading", "webapp", "using", "adobe", "embed", "api", "using", "round", "work", "design", "futuristic", "webapp", "world", "flooded", "documents", "wins", "content", "context", "building", "tools", "future", "read", "learn", "connect", "insight", "whisperer", "stage", "time", "read", "between", "lines", "connect", "dots", "build", "experience", "feels", "magic", "go", "understand", "document", "theme", "connecting", "dots", "through", "docs", "handed", "instead", "simply", "reading", "tasked", "making", "sense", "machine", "job", "extract", "structured", "outline", "document", "essentially", "title", "headings", "clean", "hierarchical", "format", "outline", "foundation", "rest", "hackathon", "journey"]:
-            return False
-        
-        # Must have at least 2 words or be a substantial single word
-        if len(text_words) == 1 and len(text) < 5:
-            return False
-        
-        # Skip if it looks like a sentence fragment
-        if text.endswith(".") and len(text) < 10:
-            return False
-        
-        # Skip if it's just a single word that's too common
-        if len(text_words) == 1 and text_words[0] in ["the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "this", "that", "which", "have", "has", "been", "will", "would", "could", "should", "you", "it", "go", "magic", "time", "lets", "ahead", "matters", "showtime", "mode", "scale", "lever", "cap", "lamp"]:
+        # Skip if it's just a single word that is likely not a heading or is a fragment
+        if len(text_words) == 1 and (text_words[0] in self.NON_HEADING_SINGLE_WORDS or text_words[0] in self.FRAGMENT_SINGLE_WORDS):
             return False
         
         return True
     
-    def get_complete_heading(self, page_lines, line_index, current_line) -> str:
-        """Get complete heading by checking until same font size or bold ends"""
-        current_text = current_line["text"].strip()
+    def get_heading_run_end(self, page_lines, line_index) -> int:
+        """Index just past the lines continuing the heading that starts at line_index"""
+        current_line = page_lines[line_index]
         current_font_size = current_line["size"]
-        current_is_bold = current_line.get("flags", 0) & 2**4
-        
-        # Start with current line text
-        complete_text = current_text
+        current_is_bold = current_line["is_bold"]
         
         # Check next lines to see if they continue the heading
         for i in range(line_index + 1, len(page_lines)):
             next_line = page_lines[i]
-            next_text = next_line["text"].strip()
-            next_font_size = next_line["size"]
-            next_is_bold = next_line.get("flags", 0) & 2**4
             
             # If font size or boldness changes, stop
-            if next_font_size != current_font_size or next_is_bold != current_is_bold:
-                break
+            if next_line["size"] != current_font_size or next_line["is_bold"] != current_is_bold:
+                return i
             
-            # If it's a standalone element (not part of a table or list), continue
-            if not self.is_part_of_table_or_list(next_text):
-                complete_text += " " + next_text
-            else:
-                break
+            # Tables and lists are not part of the heading
+            if self.is_part_of_table_or_list(next_line["text"]):
+                return i
+        
+        return len(page_lines)
+    
+    def get_complete_heading(self, page_lines, line_index, current_line, run_end: Optional[int] = None) -> str:
+        """Get complete heading by checking until same font size or bold ends
+
+        run_end is a get_heading_run_end() result for this or an earlier line of
+        the same run; every line inside a run shares its end, so callers walking
+        a page in order can pass it on instead of rescanning the run per heading.
+        """
+        if run_end is None:
+            run_end = self.get_heading_run_end(page_lines, line_index)
         
-        return complete_text.strip()
+        return " ".join(line["text"] for line in page_lines[line_index:run_end]).strip()
     
     def is_part_of_table_or_list(self, text: str) -> bool:
         """Check if text is part of a table or list"""
         # Skip if it's a bullet point
-        if text.startswith(('•', '*', '-', '◦', '▪', '▫')):
+        if text[:1] in BULLET_CHARS:
             return True
         
         # Skip if it's a numbered list
-        if re.match(r'^\d+\.\s+', text):
+        if NUMBERED_PREFIX_RE.match(text):
             return True
         
         # Skip if it contains table separators
@@ -861,9 +909,9 @@ class HighPerformancePDFProcessor:
             page_lines = self.extract_text_with_formatting(page)
             
             for line in page_lines:
-                text = line["text"].strip()
+                text = line["text"]
                 font_size = line["size"]
-                is_bold = line.get("flags", 0) & 2**4
+                is_bold = line["is_bold"]
                 
                 # Only consider non-bold text for body font size calculation
                 if not is_bold and len(text) > 10:  # Reasonable length for body text
@@ -871,7 +919,6 @@ class HighPerformancePDFProcessor:
         
         if font_sizes:
             # Return the most common font size
-            from collections import Counter
             most_common = Counter(font_sizes).most_common(1)
             return most_common[0][0]
         
@@ -886,9 +933,9 @@ class HighPerformancePDFProcessor:
             page_lines = self.extract_text_with_formatting(page)
             
             for line in page_lines:
-                text = line["text"].strip()
+                text = line["text"]
                 font_size = line["size"]
-                is_bold = line.get("flags", 0) & 2**4
+                is_bold = line["is_bold"]
                 
                 # Rule: A line is a candidate if it is bold and its font size is larger than body text
                 # Also consider non-bold text if it's significantly larger than body text
@@ -947,9 +994,8 @@ class HighPerformancePDFProcessor:
                 continue
             
             # Remove if it's just common words
-            common_words = ["the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "this", "that", "which", "have", "has", "been", "will", "would", "could", "should"]
             text_words = text.lower().split()
-            if len(text_words) <= 3 and all(word in common_words for word in text_words):
+            if len(text_words) <= 3 and self.COMMON_WORDS.issuperset(text_words):
                 continue
             
             # Remove sentence fragments
@@ -1028,7 +1074,7 @@ class HighPerformancePDFProcessor:
                 return True
 
         # Check for numbered patterns
-        if re.match(r'^\d+\.', text) or re.match(r'^[a-z]\.', text):
+        if NUM_DOT_PREFIX_RE.match(text) or ALPHA_DOT_PREFIX_RE.match(text):
             return True
 
         # Check for colon patterns (common in subsections)
@@ -1042,66 +1088,69 @@ class HighPerformancePDFProcessor:
         if not outline:
             return []
         
-        # Remove duplicates while preserving order
-        seen = set()
-        cleaned = []
+        # Remove duplicates while preserving order (dicts keep insertion order).
+        # Keys use the cleaned text, so entries differing only in spacing collapse.
+        deduplicated = {}
         
         for item in outline:
-            # Create a key for deduplication
-            key = (item["text"].lower().strip(), item["page"])
-            if key not in seen:
-                seen.add(key)
-                # Clean text
-                item["text"] = re.sub(r'\s+', ' ', item["text"]).strip()
-                cleaned.append(item)
-        
-        # Limit to reasonable number of outline items
-        return cleaned[:50]
+            clean_text = WHITESPACE_RE.sub(' ', item["text"]).strip()
+            key = (clean_text.lower(), item["page"])
+            if key not in deduplicated:
+                item["text"] = clean_text
+                deduplicated[key] = item
+                # Limit to reasonable number of outline items
+                if len(deduplicated) == 50:
+                    break
+        
+        return list(deduplicated.values())
     
-    def extract_title(self, doc) -> str:
-        """Extract document title using the most prominent text on the first page"""
+    def title_prominence(self, text: str, font_size: float, is_bold) -> Optional[float]:
+        """Prominence score of a first-page line as a title candidate, or None if it cannot be one"""
+        # Skip if too short or too long
+        if len(text) < 3 or len(text) > 100:
+            return None
+        
+        # Skip if it's just numbers or special characters
+        if text.isdigit() or not any(c.isalnum() for c in text):
+            return None
+        
+        # Skip common non-title text
+        if text.lower() in ["document", "page", "sample", "template", "welcome", "introduction", "adobe", "challenge", "round"]:
+            return None
+        
+        # Skip if it starts with common non-title patterns
+        if text.startswith(("http", "www", "Adobe", "Round", "Challenge")):
+            return None
+        
+        # Calculate prominence score (font size + bold bonus)
+        prominence = font_size
+        if is_bold:
+            prominence += 2
+        return prominence
+
+    def extract_title(self, doc, first_page_lines: Optional[List[Dict]] = None) -> str:
+        """Extract document title using the most prominent text on the first page
+
+        Pass the first page's extract_text_with_formatting() output as
+        first_page_lines to reuse an extraction the caller already did.
+        """
         if len(doc) > 0:
-            page = doc[0]
-            page_lines = self.extract_text_with_formatting(page)
+            page_lines = first_page_lines
+            if page_lines is None:
+                page_lines = self.extract_text_with_formatting(doc[0])
             
-            # Find the most prominent text (largest font size) on the first page
-            prominent_texts = []
+            # Find the most prominent text (largest font size) on the first page;
+            # a streaming max keeps the first of equally prominent lines
+            best_text, best_prominence = None, -math.inf
             
             for line in page_lines:
-                text = line["text"].strip()
-                font_size = line["size"]
-                is_bold = line.get("flags", 0) & 2**4
-                
-                # Skip if too short or too long
-                if len(text) < 3 or len(text) > 100:
-                    continue
-                
-                # Skip if it's just numbers or special characters
-                if text.isdigit() or not any(c.isalnum() for c in text):
-                    continue
-                
-                # Skip common non-title text
-                if text.lower() in ["document", "page", "sample", "template", "welcome", "introduction", "adobe", "challenge", "round"]:
-                    continue
-                
-                # Skip if it starts with common non-title patterns
-                if text.startswith(("http", "www", "Adobe", "Round", "Challenge")):
-                    continue
-                
-                # Calculate prominence score (font size + bold bonus)
-                prominence = font_size
-                if is_bold:
-                    prominence += 2
-                
-                prominent_texts.append({
-                    "text": text,
-                    "prominence": prominence
-                })
+                text = line["text"]
+                prominence = self.title_prominence(text, line["size"], line["is_bold"])
+                if prominence is not None and prominence > best_prominence:
+                    best_text, best_prominence = text, prominence
             
-            # Sort by prominence and return the most prominent
-            if prominent_texts:
-                prominent_texts.sort(key=lambda x: x["prominence"], reverse=True)
-                return prominent_texts[0]["text"]
+            if best_text is not None:
+                return best_text
         
         # Fallback: Use filename
         filename = doc.name if hasattr(doc, 'name') else ""
@@ -1116,6 +1165,14 @@ class HighPerformancePDFProcessor:
     
     def process_single_pdf(self, pdf_path: Path, output_dir: Path) -> bool:
         """Process a single PDF file"""
+        output_data = self.extract_document_outline(pdf_path)
+        if output_data is None:
+            return False
+        return write_output_json(output_dir / f"{pdf_path.stem}.json", output_data)
+
+    def extract_document_outline(self, pdf_path: Path) -> Optional[Dict]:
+        """Extract the title and outline of a PDF, or None if it cannot be processed"""
+        doc = None
         try:
             start_time = time.time()
             logger.info(f"Processing {pdf_path.name}")
@@ -1123,17 +1180,26 @@ class HighPerformancePDFProcessor:
             # Open PDF
             doc = fitz.open(pdf_path)
 
+            # Lay out the leading pages once; language detection, title and
+            # outline extraction all read them
+            sample_textpages = self.get_sample_textpages(doc)
+
             # Detect document language for multilingual support
-            detected_language = self.detect_document_language(doc)
+            detected_language = self.detect_document_language(doc, sample_textpages)
 
             # Get language-specific patterns
             language_patterns = self.get_patterns_for_language(detected_language)
 
+            # Extract the leading pages once; title and outline extraction share them
+            sample_dicts = self.get_sample_page_dicts(doc, textpages=sample_textpages)
+            del sample_textpages
+            first_page_lines = self.extract_text_with_formatting(doc[0], sample_dicts[0]) if sample_dicts else None
+
             # Extract title
-            title = self.extract_title(doc)
+            title = self.extract_title(doc, first_page_lines)
 
             # Extract outline from content analysis (more aggressive)
-            outline = self.extract_outline_from_content(doc, language_patterns)
+            outline = self.extract_outline_from_content(doc, language_patterns, sample_dicts, first_page_lines)
             
             # If we don't have enough headings, try TOC as backup
             if len(outline) < 3:
@@ -1157,32 +1223,161 @@ class HighPerformancePDFProcessor:
                 "outline": outline
             }
             
-            # Save output (always overwrite)
-            output_file = output_dir / f"{pdf_path.stem}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            
-            doc.close()
-            
             processing_time = time.time() - start_time
             logger.info(f"Processed {pdf_path.name} in {processing_time:.2f}s")
-            return True
+            return output_data
             
         except Exception as e:
             logger.error(f"Error processing {pdf_path.name}: {e}")
-            return False
+            return None
+        
+        finally:
+            if doc is not None:
+                doc.close()
+
+def write_output_json(output_file: Path, output_data: Dict) -> bool:
+    """Write one outline JSON file (always overwriting)
+
+    The output directory is created once by process_pdfs before any file is
+    written, so this only opens, writes and closes the file itself.
+
+    The JSON is written to a temporary file next to output_file and renamed
+    over it, so an interrupted write never leaves a truncated file that the
+    up-to-date check in process_pdfs would then trust.
+    """
+    temp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        if orjson is not None:
+            # Same layout as json.dump(indent=2, ensure_ascii=False), as UTF-8 bytes
+            data = orjson.dumps(output_data, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(output_data, indent=2, ensure_ascii=False).encode('utf-8')
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(temp_file, output_file)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing {output_file.name}: {e}")
+        try:
+            os.unlink(temp_file)
+        except OSError:
+            pass
+        return False
+
+# Combined output written when EMIT_AGGREGATE is set (see process_pdfs). It
+# lives in a subdirectory so it can never clash with a per-file <stem>.json.
+AGGREGATE_OUTPUT_PATH = Path("aggregate") / "all.json"
+
+# Processor shared by every file a worker process handles (see init_worker)
+worker_processor: Optional[HighPerformancePDFProcessor] = None
 
-def process_pdfs():
+def init_worker():
+    """Build one processor per worker process, reused for all of its files
+
+    The processor is built in the worker because fitz documents cannot be
+    pickled across process boundaries; building it once keeps its pattern
+    tables alive across files.
+    """
+    global worker_processor
+    # Keep MuPDF's per-file parse warnings from interleaving on stderr across
+    # workers; damaged files still surface through the logged exceptions
+    fitz.TOOLS.mupdf_display_errors(False)
+    worker_processor = HighPerformancePDFProcessor()
+
+def extract_one(pdf_path: str) -> Optional[Dict]:
+    """Extract a single PDF's outline inside a worker process
+
+    The path arrives as a plain string, which pickles smaller and faster than a
+    Path. The outline is returned to the parent, which writes it; see process_pdfs.
+    """
+    processor = worker_processor
+    if processor is None:
+        # Called outside a pool set up with init_worker
+        processor = HighPerformancePDFProcessor()
+    return processor.extract_document_outline(Path(pdf_path))
+
+def advise_readahead(pdf_files: List[Path]):
+    """Ask the kernel to start reading the input PDFs into the page cache
+
+    Advisory only, and a no-op where posix_fadvise is unavailable (non-Linux);
+    files that cannot be opened are left for the workers to report.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for pdf_file in pdf_files:
+        try:
+            fd = os.open(pdf_file, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+def resolve_worker_count() -> int:
+    """Number of worker processes: PDF_WORKERS if set to a positive integer, else the CPU count"""
+    env_workers = os.environ.get("PDF_WORKERS")
+    if env_workers:
+        try:
+            workers = int(env_workers)
+            if workers > 0:
+                return workers
+        except ValueError:
+            pass
+        logger.warning(f"Ignoring invalid PDF_WORKERS={env_workers!r}, using the CPU count")
+    return mp.cpu_count()
+
+def resolve_io_dirs() -> Tuple[Path, Path]:
+    """Resolve the (input, output) directories for a run
+
+    PDF_INPUT_DIR and PDF_OUTPUT_DIR override the defaults; without them the
+    Docker paths are used when /app/input exists, local ./input and ./output
+    otherwise.
+    """
+    env_input_dir = os.environ.get("PDF_INPUT_DIR")
+    env_output_dir = os.environ.get("PDF_OUTPUT_DIR")
+    if env_input_dir:
+        return Path(env_input_dir), Path(env_output_dir or "output")
+
+    # Use local directories for testing, Docker paths for production
+    docker_input_dir = Path("/app/input")
+    if docker_input_dir.exists():
+        return docker_input_dir, Path(env_output_dir or "/app/output")
+    return Path("input"), Path(env_output_dir or "output")
+
+def output_is_current(pdf_file: Path, output_file: Path) -> bool:
+    """True if output_file exists and is at least as new as pdf_file"""
+    try:
+        return output_file.stat().st_mtime >= pdf_file.stat().st_mtime
+    except OSError:
+        return False
+
+def process_pdfs(force: bool = False, fail_fast: bool = False) -> bool:
     """
     Main processing function - Entry point for PDF processing
 
+    PDFs whose JSON output is already newer than the PDF are skipped unless
+    force is set. With fail_fast, the first PDF that fails to process stops
+    the run: files not yet started are cancelled, files already running finish,
+    and every outline extracted is still written.
+
+    Returns True if every PDF was processed and written, False otherwise.
+
     EXECUTION WORKFLOW:
     ==================
     1. Detect environment (Docker vs Local)
     2. Set up input/output directories
     3. Find all PDF files in input directory
-    4. Initialize high-performance processor
-    5. Process files with threading for I/O optimization
+    4. Fan files out to a process pool (one processor per worker, built by init_worker)
+       and write their JSON on a thread pool in the parent
+    5. Process files in parallel across CPU cores
     6. Generate JSON output files with exact hackathon format
 
     DIRECTORY STRUCTURE:
@@ -1195,6 +1390,15 @@ def process_pdfs():
         ./input/     - PDF files to process
         ./output/    - Generated JSON files
 
+    Overrides (see resolve_io_dirs):
+        PDF_INPUT_DIR  - PDF files to process
+        PDF_OUTPUT_DIR - Generated JSON files
+
+    PDF_WORKERS sets the number of worker processes (default: CPU count).
+    EMIT_AGGREGATE additionally writes aggregate/all.json, mapping each PDF file
+    name to its output, alongside the per-file JSON; up-to-date outputs are not
+    skipped then, so the aggregate covers every input.
+
     OUTPUT FORMAT:
     =============
     Each PDF generates filename.json with structure:
@@ -1206,48 +1410,128 @@ def process_pdfs():
         ]
     }
     """
-    # Use local directories for testing, Docker paths for production
-    if Path("/app/input").exists():
-        input_dir = Path("/app/input")
-        output_dir = Path("/app/output")
-    else:
-        input_dir = Path("input")
-        output_dir = Path("output")
+    input_dir, output_dir = resolve_io_dirs()
     
-    # Ensure output directory exists
+    # Ensure output directory exists; this is the only check, writes assume it
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Find all PDF files
-    pdf_files = list(input_dir.glob("*.pdf"))
+    # Find all PDF files; scandir's cached entry type saves a stat per file
+    # A missing input directory simply has no PDFs
+    try:
+        with os.scandir(input_dir) as entries:
+            pdf_entries = [entry for entry in entries if entry.name.endswith(".pdf") and entry.is_file()]
+    except FileNotFoundError:
+        pdf_entries = []
+    
+    # Largest files first: the longest jobs start early and small ones fill the
+    # idle tail of the pool instead of a big file finishing last on its own
+    pdf_entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
+    pdf_files = [Path(entry.path) for entry in pdf_entries]
     
     if not pdf_files:
         logger.warning("No PDF files found in input directory")
-        return
+        return True
+    
+    # The aggregate must cover every PDF, so it needs all of them processed
+    emit_aggregate = bool(os.environ.get("EMIT_AGGREGATE"))
+    
+    if not force and not emit_aggregate:
+        # Re-runs only redo PDFs that changed since their output was written
+        pending = []
+        for pdf_file in pdf_files:
+            if output_is_current(pdf_file, output_dir / f"{pdf_file.stem}.json"):
+                logger.debug(f"Skipping {pdf_file.name}, output is up to date")
+            else:
+                pending.append(pdf_file)
+        if not pending:
+            logger.info(f"All {len(pdf_files)} PDF outputs are up to date (use --force to reprocess)")
+            return True
+        pdf_files = pending
     
     logger.info(f"Found {len(pdf_files)} PDF files to process")
     
-    # Initialize processor
-    processor = HighPerformancePDFProcessor()
+    # Cold-cache reads of the later files overlap with worker start-up and the
+    # first files' parsing. posix_fadvise only queues the readahead and does not
+    # block, so the hints are issued inline; no thread is left running when the
+    # pool forks its workers.
+    advise_readahead(pdf_files)
     
-    # Process files with threading for I/O optimization
-    max_workers = min(mp.cpu_count(), len(pdf_files), 4)  # Limit concurrent processing
+    # Process files in separate processes: heading detection is CPU-bound
+    # Python, so threads would serialize on the GIL. Each worker is its own
+    # interpreter, so one per core (never more than there are files).
+    max_workers = min(resolve_worker_count(), len(pdf_files))
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(processor.process_single_pdf, pdf_file, output_dir): pdf_file 
-            for pdf_file in pdf_files
-        }
+    # Workers only parse and classify; the parent writes each JSON file on a
+    # small thread pool, so file I/O overlaps with the parsing still running
+    succeeded = True
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as executor, \
+            ThreadPoolExecutor(max_workers=4) as writer:
+        writes = []
+        # Optional single file holding every outline, keyed by PDF file name
+        aggregate = {} if emit_aggregate else None
+        
+        def collect(pdf_file: Path, output_data: Optional[Dict]) -> bool:
+            """Queue one extracted outline for writing; False if extraction failed"""
+            nonlocal succeeded
+            if output_data is None:
+                logger.error(f"Failed to process {pdf_file.name}")
+                succeeded = False
+                return False
+            output_file = output_dir / f"{pdf_file.stem}.json"
+            writes.append((pdf_file, writer.submit(write_output_json, output_file, output_data)))
+            if aggregate is not None:
+                aggregate[pdf_file.name] = output_data
+            return True
         
-        for future in as_completed(futures):
-            pdf_file = futures[future]
+        if fail_fast:
+            # One future per file, handled as each finishes, so the first failure
+            # is seen at once and every file not yet started can be cancelled
+            futures = {executor.submit(extract_one, str(pdf_file)): pdf_file for pdf_file in pdf_files}
+            unhandled = set(futures)
+            try:
+                for future in as_completed(futures):
+                    unhandled.discard(future)
+                    if not collect(futures[future], future.result()):
+                        logger.error("Stopping at the first failure (fail-fast)")
+                        break
+            except Exception as e:
+                # extract_document_outline reports its own errors, so this is the pool itself failing
+                logger.error(f"Exception processing PDFs: {e}")
+                succeeded = False
+            
+            # Cancel the files not yet started and wait for the running ones;
+            # whatever they extracted is still written
+            executor.shutdown(cancel_futures=True)
+            for future, pdf_file in futures.items():
+                if future in unhandled and not future.cancelled() and future.exception() is None:
+                    collect(pdf_file, future.result())
+        else:
+            # One file per task: the files are sorted largest first, so
+            # contiguous batches would hand all of the biggest files to a
+            # single worker. A round trip per file is small next to parsing it.
+            results = executor.map(extract_one, map(str, pdf_files), chunksize=1)
             try:
-                success = future.result()
-                if not success:
-                    logger.error(f"Failed to process {pdf_file.name}")
+                # Results arrive in input order, one per file
+                for pdf_file, output_data in zip(pdf_files, results):
+                    collect(pdf_file, output_data)
             except Exception as e:
-                logger.error(f"Exception processing {pdf_file.name}: {e}")
+                # extract_document_outline reports its own errors, so this is the pool itself failing
+                logger.error(f"Exception processing PDFs: {e}")
+                succeeded = False
+        
+        for pdf_file, write in writes:
+            if not write.result():
+                logger.error(f"Failed to process {pdf_file.name}")
+                succeeded = False
+        
+        if aggregate:
+            aggregate_file = output_dir / AGGREGATE_OUTPUT_PATH
+            aggregate_file.parent.mkdir(exist_ok=True)
+            if not write_output_json(aggregate_file, aggregate):
+                succeeded = False
     
     logger.info("PDF processing completed")
+    return succeeded
 
 if __name__ == "__main__":
     """
@@ -1261,6 +1545,8 @@ if __name__ == "__main__":
 
     2. Local Python (Development/Testing):
        python process_pdfs.py
+       python process_pdfs.py --force   # also redo PDFs with up-to-date output
+       python process_pdfs.py --fail-fast   # stop at the first failing PDF, exit status 1
 
     3. Local Testing with Sample:
        mkdir -p input output
@@ -1275,4 +1561,12 @@ if __name__ == "__main__":
     - Output: Exact JSON format compliance
     - Error Handling: Graceful failures with comprehensive logging
     """
-    process_pdfs()
+    parser = argparse.ArgumentParser(description="Extract titles and heading outlines from PDFs")
+    parser.add_argument("--force", action="store_true",
+                        help="reprocess PDFs whose JSON output is already up to date")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="stop at the first PDF that fails to process and exit with status 1")
+    args = parser.parse_args()
+    succeeded = process_pdfs(force=args.force, fail_fast=args.fail_fast)
+    if args.fail_fast and not succeeded:
+        sys.exit(1)